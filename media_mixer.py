@@ -4,7 +4,6 @@ Media Mixer - Tool to combine audio files with video/image files.
 import sys
 import argparse
 import logging
-from pathlib import Path
 
 from src.utils.package_manager import check_and_install_dependencies
 
@@ -22,14 +21,17 @@ logger = logging.getLogger(__name__)
 def process_cli(input_dir: str) -> int:
     """Process media files using command line interface."""
     # Local import to avoid loading heavy modules if not needed
+    from PyQt6.QtCore import Qt
     from src.controllers.media_controller import MediaController
-    from src.controllers.media_processor import MediaProcessor
 
     try:
         controller = MediaController()
         # Note: The CLI does not support waveform generation yet.
         # The controller's directory processing task is now the primary method.
-        controller.progress_update.connect(logger.info)
+        # Progress is also emitted from processing threads, and without an
+        # event loop queued calls would never be delivered; logging is
+        # thread-safe, so call the logger directly.
+        controller.progress_update.connect(logger.info, Qt.ConnectionType.DirectConnection)
         controller.processing_finished.connect(lambda success: logger.info("CLI processing finished."))
         
         # This is a blocking call for the CLI version
@@ -1,34 +1,81 @@
 """Application settings and constants."""
 import os
-from pathlib import Path
 
 # Supported file formats
-SUPPORTED_VIDEO_FORMATS = ['.mp4']
-SUPPORTED_AUDIO_FORMATS = ['.mp3']
-SUPPORTED_IMAGE_FORMATS = ['.jpg', '.jpeg', '.webp', '.png']
+SUPPORTED_VIDEO_FORMATS = frozenset({'.mp4'})
+SUPPORTED_AUDIO_FORMATS = frozenset({'.mp3'})
+# Preferred image when several share a base name (lower wins)
+IMAGE_FORMAT_PRIORITY = {ext: i for i, ext in enumerate(['.jpg', '.jpeg', '.webp', '.png'])}
+SUPPORTED_IMAGE_FORMATS = frozenset(IMAGE_FORMAT_PRIORITY)
 
 # Folder names
 RESULTS_FOLDER = '__results'  # Main results folder in input directory
+ENCODE_STATE_FILE = '.enc_state'  # Options each output was built with, inside RESULTS_FOLDER
 
 # File name patterns
 RESULT_FILE_PREFIX = ''
-TEMP_VIDEO_NAME = 'temp_video.mp4'
-TEMP_SILENT_VIDEO_NAME = 'temp_silent.mp4'
-CONCAT_FILE_NAME = 'concat.txt'
 
 # FFmpeg settings
 FFMPEG_PATH = r"C:\Windows\System32\ffmpeg.exe"
+# ffprobe ships alongside ffmpeg in every FFmpeg build
+FFPROBE_PATH = os.path.join(
+    os.path.dirname(FFMPEG_PATH),
+    'ffprobe' + os.path.splitext(FFMPEG_PATH)[1]
+)
 DEFAULT_FRAMERATE = 30
 DEFAULT_AUDIO_BITRATE = '192k'
+# libx264 preset, fastest to slowest: ultrafast, superfast, veryfast, faster,
+# fast, medium, slow, slower, veryslow, placebo. Slower presets compress
+# better at the same quality but take much longer to encode.
 DEFAULT_VIDEO_PRESET = 'ultrafast'
+# Seconds between keyframes (GOP length); longer GOPs make smaller files
+KEYFRAME_INTERVAL = 2
 VIDEO_DIMENSIONS = '1920:1080'
 
+# H.264 encoder: 'auto' uses the first hardware encoder from HW_VIDEO_ENCODERS
+# that works on this machine and falls back to libx264. Set an encoder name
+# (e.g. 'libx264') to skip detection.
+VIDEO_ENCODER = 'auto'
+HW_VIDEO_ENCODERS = ['h264_nvenc', 'h264_qsv', 'h264_videotoolbox', 'h264_amf']
+# Constant-quality level shared by the encoders (libx264's CRF scale; lower
+# is better). Hardware encoders get the closest equivalent of the same value
+# so 'auto' does not silently change output quality.
+VIDEO_QUALITY = '23'
+# VideoToolbox's constant-quality mode is not available on every Mac, so it
+# gets a fixed bitrate instead of FFmpeg's generic 200 kb/s default
+VIDEOTOOLBOX_BITRATE = '6M'
+# Encoder-specific options producing Main@4.0 output
+VIDEO_ENCODER_ARGS = {
+    'libx264': ['-preset', DEFAULT_VIDEO_PRESET, '-profile:v', 'main', '-level', '4.0',
+                '-crf', VIDEO_QUALITY],
+    # Adaptive quantization and lookahead off: lowest NVENC latency
+    'h264_nvenc': ['-preset', 'p1', '-profile:v', 'main', '-level', '4.0',
+                   '-spatial_aq', '0', '-temporal_aq', '0', '-rc-lookahead', '0',
+                   '-rc', 'vbr', '-cq', VIDEO_QUALITY, '-b:v', '0'],
+    'h264_qsv': ['-preset', 'veryfast', '-profile:v', 'main', '-level', '40',
+                 '-global_quality', VIDEO_QUALITY],
+    'h264_videotoolbox': ['-profile:v', 'main', '-level', '4.0', '-b:v', VIDEOTOOLBOX_BITRATE],
+    'h264_amf': ['-quality', 'speed', '-profile:v', 'main', '-level', '4.0',
+                 '-rc', 'cqp', '-qp_i', VIDEO_QUALITY, '-qp_p', VIDEO_QUALITY],
+}
+
+# Number of media pairs encoded concurrently. Each FFmpeg job is capped at
+# PARALLEL_JOB_FFMPEG_THREADS; x264 gains little past a few threads per
+# encode, so more concurrent jobs keep all cores busy more effectively.
+MAX_WORKERS = max(1, (os.cpu_count() or 1) // 2)
+# Hardware encoders have a small, fixed number of sessions (consumer NVENC
+# allows a handful), so jobs on a hardware encoder are capped further.
+HW_ENCODER_MAX_WORKERS = 2
+# FFmpeg -threads per job: 0 lets a lone job use every core
+SINGLE_JOB_FFMPEG_THREADS = 0
+PARALLEL_JOB_FFMPEG_THREADS = 2
+# Waveform frames are rendered in chunks of WAVEFORM_CHUNK_FRAMES on this many threads
+WAVEFORM_RENDER_THREADS = 4
+WAVEFORM_CHUNK_FRAMES = 16
+
 # FFmpeg commands
 FFMPEG_VIDEO_FILTERS = f'scale={VIDEO_DIMENSIONS}:force_original_aspect_ratio=decrease,pad={VIDEO_DIMENSIONS}:(ow-iw)/2:(oh-ih)/2'
 
 # Logging format
 LOG_FORMAT = '%(message)s'
-LOG_LEVEL = 'INFO'
-
-# Preserve temporary files (set to True to keep __results/temp for debugging)
-PRESERVE_TEMP = False
\ No newline at end of file
+LOG_LEVEL = 'INFO'
\ No newline at end of file
@@ -5,9 +5,13 @@ between the user interface (View) and the data models/processing logic (Model).
 It uses a QObject-based approach to run tasks in a separate thread and
 communicate with the UI via signals.
 """
+import os
 import logging
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 from PyQt6.QtCore import QObject, pyqtSignal, QThread
 
@@ -17,6 +21,111 @@ from src.utils import helpers
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=64)
+def _cached_matches(input_dir_str: str, mtime_ns: int) -> Tuple[Tuple[str, Path, type, Path], ...]:
+    """Memoized directory listing keyed by path and directory modification time.
+
+    The listing pass keeps only file names and returns the
+    (base_name, audio_path, media_cls, media_path) tuples that form a pair.
+    """
+    input_dir = Path(input_dir_str)
+    audio_names = {}
+    # Only the preferred video/image per base name is kept: the
+    # alphabetically first video, or the image with the best format rank.
+    video_best = {}
+    image_best = {}
+    # DirEntry caches the file type from the directory listing, so this
+    # avoids a stat() per file that Path.is_file() would cost.
+    with os.scandir(input_dir) as it:
+        for entry in it:
+            if not entry.is_file(): continue
+            name = entry.name
+            # Same split as os.path.splitext, without the extra call overhead
+            dot = name.rfind('.')
+            if dot > 0:
+                base_name, ext = name[:dot], name[dot:].lower()
+            else:
+                base_name, ext = name, ''
+            if ext in settings.SUPPORTED_AUDIO_FORMATS:
+                audio_names[base_name] = name
+            elif ext in settings.SUPPORTED_VIDEO_FORMATS:
+                current = video_best.get(base_name)
+                if current is None or name < current:
+                    video_best[base_name] = name
+            elif ext in settings.SUPPORTED_IMAGE_FORMATS:
+                rank = (settings.IMAGE_FORMAT_PRIORITY[ext], name)
+                current = image_best.get(base_name)
+                if current is None or rank < current:
+                    image_best[base_name] = rank
+
+    matches = []
+    for base_name, audio_name in audio_names.items():
+        if base_name in video_best:
+            media_cls, media_name = VideoFile, video_best[base_name]
+        elif base_name in image_best:
+            media_cls, media_name = ImageFile, image_best[base_name][1]
+        else:
+            continue
+        matches.append((base_name, input_dir / audio_name, media_cls, input_dir / media_name))
+    return tuple(matches)
+
+
+def _iter_pairs(input_dir: Path) -> Iterator[MediaPair]:
+    """Yield the MediaPairs found in a directory one at a time.
+
+    Model objects are built, and audio durations probed, only for files
+    that actually form a pair.
+    """
+    # Adding, removing or renaming a file bumps the directory mtime,
+    # which invalidates the cached listing for that directory.
+    matches = _cached_matches(str(input_dir), os.stat(input_dir).st_mtime_ns)
+
+    # Each probe is a blocking ffprobe subprocess, so overlap them in threads
+    with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2) as executor:
+        futures = [executor.submit(helpers.probe_duration, match[1]) for match in matches]
+        for (base_name, audio_path, media_cls, media_path), future in zip(matches, futures):
+            try:
+                duration = future.result()
+            except Exception as e:
+                logger.warning(f"Could not read audio file {audio_path.name}: {e}")
+                continue
+            yield MediaPair(
+                audio=AudioFile(path=audio_path, base_name=base_name, duration=duration),
+                media=media_cls(path=media_path, base_name=base_name)
+            )
+
+
+class _ProgressThrottle:
+    """Coalesce progress percentages so many short jobs do not flood the UI."""
+
+    def __init__(self, signal, min_interval_ms: int = 100):
+        self._signal = signal
+        self._min_interval = min_interval_ms / 1000
+        self._last_value = None
+        self._last_time = 0.0
+        self._pending = None
+
+    def emit(self, value: int):
+        """Emit value unless it repeats the last one or arrives too soon."""
+        if value == self._last_value:
+            return
+        now = time.monotonic()
+        if value < 100 and now - self._last_time < self._min_interval:
+            self._pending = value
+            return
+        self._signal.emit(value)
+        self._last_value = value
+        self._last_time = now
+        self._pending = None
+
+    def flush(self):
+        """Emit the most recent value held back by the throttle, if any."""
+        if self._pending is not None:
+            self._signal.emit(self._pending)
+            self._last_value = self._pending
+            self._pending = None
+
+
 class Worker(QObject):
     """Run a function in a background thread and forward progress signals."""
     progress_update = pyqtSignal(str)
@@ -92,52 +201,54 @@ class MediaController(QObject):
 
         results_dir = input_dir / settings.RESULTS_FOLDER
         helpers.ensure_directory(results_dir)
-        processor = MediaProcessor(results_dir)
+        processor = MediaProcessor.for_results_dir(results_dir)
+
+        # Skip pairs whose output is newer than its sources and was built
+        # with the same options, so re-runs only redo missing or stale files.
+        encode_state = helpers.load_encode_state(results_dir)
+        options = {'waveform': waveform_effect if add_waveform else None}
+        pending = []
+        for pair in pairs:
+            output_path = results_dir / pair.output_name
+            if encode_state.get(pair.output_name) == options and helpers.is_up_to_date(output_path, pair.audio.path, pair.media.path):
+                self.progress_update.emit(f"Skipping (up-to-date): {pair.audio.base_name}")
+            else:
+                pending.append(pair)
+        if not pending:
+            self.progress_value.emit(100)
+            self.progress_update.emit("\nAll outputs are up to date.")
+            return
+        pairs = pending
+        # Forget the recorded options of every output about to be rebuilt, so
+        # a run interrupted mid-encode cannot leave a partial file that a
+        # later run would take for up to date.
+        for pair in pairs:
+            encode_state.pop(pair.output_name, None)
+        helpers.save_encode_state(results_dir, encode_state)
         
         self.progress_update.emit(f"Found {len(pairs)} pairs to process.")
         total = len(pairs)
-        for index, pair in enumerate(pairs, 1):
-            try:
-                media_type = "Video" if pair.is_video else "Image"
-                self.progress_update.emit(f"\nProcessing {index}/{total}: {pair.audio.name} + {pair.media.name} ({media_type})")
-                processor.process_media_pair(pair, add_waveform=add_waveform, waveform_effect=waveform_effect)
-                self.progress_value.emit(int((index / total) * 100))
-            except Exception as e:
-                self.progress_update.emit(f"Error processing {pair.audio.base_name}: {str(e)}")
+
+        def _on_start(index, pair):
+            media_type = "Video" if pair.is_video else "Image"
+            self.progress_update.emit(f"\nProcessing {index}/{total}: {pair.audio.name} + {pair.media.name} ({media_type})")
+
+        progress = _ProgressThrottle(self.progress_value)
+        results = processor.process_many(pairs, add_waveform=add_waveform, waveform_effect=waveform_effect, on_start=_on_start)
+        for done, (pair, error) in enumerate(results, 1):
+            if error is None:
+                encode_state[pair.output_name] = options
+                helpers.save_encode_state(results_dir, encode_state)
+                progress.emit(int((done / total) * 100))
+            else:
+                self.progress_update.emit(f"Error processing {pair.audio.base_name}: {str(error)}")
+        progress.flush()
         
         self.progress_update.emit("\nDirectory processing complete.")
 
     def _scan_for_pairs(self, input_dir: Path) -> List[MediaPair]:
         """Scans a directory and returns a list of MediaPairs."""
-        from moviepy.editor import AudioFileClip
-        audio_files = {}
-        video_files = {}
-        image_files = {}
-        for f in input_dir.iterdir():
-            if not f.is_file(): continue
-            ext = f.suffix.lower()
-            base_name = f.stem
-            if ext in settings.SUPPORTED_AUDIO_FORMATS:
-                try:
-                    with AudioFileClip(str(f)) as clip:
-                        audio_files[base_name] = AudioFile(path=f, base_name=base_name, duration=clip.duration)
-                except Exception as e:
-                    logger.warning(f"Could not read audio file {f.name}: {e}")
-            elif ext in settings.SUPPORTED_VIDEO_FORMATS:
-                video_files.setdefault(base_name, []).append(VideoFile(path=f, base_name=base_name))
-            elif ext in settings.SUPPORTED_IMAGE_FORMATS:
-                image_files.setdefault(base_name, []).append(ImageFile(path=f, base_name=base_name))
-
-        pairs = []
-        for base_name, audio_file in audio_files.items():
-            media_file = None
-            if base_name in video_files:
-                media_file = sorted(video_files[base_name], key=lambda x: x.path.name)[0]
-            elif base_name in image_files:
-                media_file = sorted(image_files[base_name], key=lambda x: (settings.SUPPORTED_IMAGE_FORMATS.index(x.extension), x.path.name))[0]
-            if media_file:
-                pairs.append(MediaPair(audio=audio_file, media=media_file))
-        return pairs
+        return list(_iter_pairs(input_dir))
 
     def process_single_pair(self, mp3_path_str: str, media_path_str: str, output_dir_str: str, add_waveform: bool = False, waveform_effect: Optional[str] = None):
         """Processes a single, user-selected pair of media files."""
@@ -145,7 +256,6 @@ class MediaController(QObject):
 
     def _single_file_processing_task(self, mp3_path_str: str, media_path_str: str, output_dir_str: str, add_waveform: bool = False, waveform_effect: Optional[str] = None):
         """Single-file processing task to be run inside the worker thread."""
-        from moviepy.editor import AudioFileClip
         from src.controllers.media_processor import MediaProcessor
 
         audio_path = Path(mp3_path_str)
@@ -156,19 +266,18 @@ class MediaController(QObject):
         self.progress_update.emit("Analyzing files...")
         self.progress_value.emit(5)
 
-        with AudioFileClip(str(audio_path)) as audio_clip:
-            audio_file = AudioFile(path=audio_path, base_name=audio_path.stem, duration=audio_clip.duration)
+        audio_file = AudioFile.from_path(audio_path, duration=helpers.probe_duration(audio_path))
 
         media_ext = media_path.suffix.lower()
         if media_ext in settings.SUPPORTED_VIDEO_FORMATS:
-            media_file = VideoFile(path=media_path, base_name=media_path.stem)
+            media_file = VideoFile.from_path(media_path)
         elif media_ext in settings.SUPPORTED_IMAGE_FORMATS:
-            media_file = ImageFile(path=media_path, base_name=media_path.stem)
+            media_file = ImageFile.from_path(media_path)
         else:
             raise ValueError("Unsupported media file type.")
 
         media_pair = MediaPair(audio=audio_file, media=media_file)
-        processor = MediaProcessor(results_dir)
+        processor = MediaProcessor.for_results_dir(results_dir)
         media_type = "Video" if media_pair.is_video else "Image"
         self.progress_update.emit(f"Processing: {media_pair.audio.name} + {media_pair.media.name} ({media_type})")
         self.progress_value.emit(10)
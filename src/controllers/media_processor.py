@@ -4,10 +4,15 @@ Media processing implementation.
 This module handles the actual media processing, including the optional
 creation of audio waveforms.
 """
+import errno
+import functools
 import subprocess
+import tempfile
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, Tuple
 
 from src.config import settings
 from src.models.media_file import MediaPair
@@ -15,14 +20,81 @@ from src.utils import helpers
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def _numba_fill_kernel():
+    """Return a compiled bar-fill kernel, or None if numba is not installed."""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    # nogil rather than parallel: chunks are already spread across render
+    # threads, and numba's parallel backend must not be entered from several
+    # threads at once.
+    @njit(cache=True, nogil=True)
+    def fill(out, col_tops, col_colors):
+        # Writes every pixel, so out may hold a previous chunk's frames
+        n_frames, height, width, channels = out.shape
+        for f in range(n_frames):
+            for y in range(height):
+                for x in range(width):
+                    lit = y >= col_tops[f, x]
+                    for c in range(channels):
+                        out[f, y, x, c] = col_colors[x, c] if lit else 0
+
+    return fill
+
+
+def _render_waveform_frames(db, time_idx, band_starts, band_stop, col_bar, col_colors, waveform_h, out=None):
+    """Render the spectrum bars for a run of STFT columns.
+
+    Depends only on its arguments, so chunks can be rendered concurrently.
+    The pixel fill uses a numba kernel when numba is installed. Pass a
+    C-contiguous uint8 `out` of the result's shape to reuse its memory;
+    its previous contents are overwritten.
+
+    Returns:
+        uint8 RGBA array of shape (len(time_idx), waveform_h, width, 4)
+    """
+    import numpy as np
+
+    band_max = np.maximum.reduceat(db[:band_stop, time_idx], band_starts, axis=0)
+    bar_heights = (np.clip((band_max.T + 80) / 80, 0, 1) * waveform_h * 0.9).astype(int)
+    # Zero-height bar for the gap columns
+    bar_heights = np.pad(bar_heights, ((0, 0), (0, 1)))
+    col_tops = waveform_h - bar_heights[:, col_bar]
+
+    if out is None:
+        # C order so the frames can be written to the pipe without a copy
+        out = np.empty((len(time_idx), waveform_h, len(col_bar), 4), dtype=np.uint8)
+    fill = _numba_fill_kernel()
+    if fill is not None:
+        fill(out, col_tops, col_colors)
+        return out
+    mask = np.arange(waveform_h)[None, :, None] >= col_tops[:, None, :]
+    return np.multiply(mask[..., None], col_colors, out=out)
+
+
 class MediaProcessor:
     """Handles the actual media processing operations."""
     
     def __init__(self, results_dir: Path):
         self.results_dir = results_dir
+        self.video_encoder, self.video_encoder_args = helpers.detect_best_encoder(settings.FFMPEG_PATH)
+        self.gop_args = ['-g', str(settings.KEYFRAME_INTERVAL * settings.DEFAULT_FRAMERATE)]
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def for_results_dir(cls, results_dir: Path) -> 'MediaProcessor':
+        """Return a shared processor for results_dir, creating it on first use."""
+        return cls(results_dir)
     
-    def process_media_pair(self, pair: MediaPair, add_waveform: bool = False, waveform_effect: Optional[str] = None) -> None:
-        """Process one audio+media pair and write an MP4 to results_dir."""
+    def process_media_pair(self, pair: MediaPair, add_waveform: bool = False, waveform_effect: Optional[str] = None,
+                           threads: int = settings.SINGLE_JOB_FFMPEG_THREADS) -> None:
+        """Process one audio+media pair and write an MP4 to results_dir.
+
+        `threads` is passed to FFmpeg as -threads; 0 means use all cores.
+        """
         output_path = self.results_dir / pair.output_name
         if output_path.exists():
             logger.info(f"Output file {output_path.name} exists. Overwriting.")
@@ -31,13 +103,13 @@ class MediaProcessor:
         try:
             if add_waveform:
                 logger.debug("Processing with audio waveform visualization")
-                self._process_with_spectrum_waveform(pair, output_path, waveform_effect)
+                self._process_with_spectrum_waveform(pair, output_path, waveform_effect, threads)
             else:
                 logger.debug("Processing with FFmpeg path")
                 if pair.is_video:
-                    self._process_video_ffmpeg(pair, output_path)
+                    self._process_video_ffmpeg(pair, output_path, threads)
                 else:
-                    self._process_image_ffmpeg(pair, output_path)
+                    self._process_image_ffmpeg(pair, output_path, threads)
             
             if output_path.exists():
                 size_mb = output_path.stat().st_size / (1024 * 1024)
@@ -46,201 +118,309 @@ class MediaProcessor:
                 raise RuntimeError("Output file was not created.")
 
         except Exception:
-            # Let caller handle error reporting; avoid duplicate logs here.
+            # Drop whatever FFmpeg wrote before failing; the caller handles
+            # error reporting, so avoid duplicate logs here.
+            output_path.unlink(missing_ok=True)
             raise
 
-    def _process_with_spectrum_waveform(self, pair: MediaPair, output_path: Path, waveform_effect: Optional[str] = None):
-        """Processes the media pair using moviepy to add a spectrum analyzer waveform."""
+    def process_many(self, pairs: Iterable[MediaPair], add_waveform: bool = False, waveform_effect: Optional[str] = None,
+                     max_workers: int = settings.MAX_WORKERS,
+                     on_start: Optional[Callable[[int, MediaPair], None]] = None) -> Iterator[Tuple[MediaPair, Optional[Exception]]]:
+        """Process several pairs concurrently, yielding each as it finishes.
+
+        Each pair is an independent FFmpeg subprocess, so threads are enough
+        to keep several encodes running side by side. A lone job may use
+        every core; concurrent jobs are capped at PARALLEL_JOB_FFMPEG_THREADS.
+        With a hardware encoder at most HW_ENCODER_MAX_WORKERS jobs run at once.
+        `on_start(index, pair)` is called from the worker thread as each pair
+        starts. Yields (pair, None) on success or (pair, error) on failure.
+        """
+        pairs = list(pairs)
+        if self.video_encoder != 'libx264':
+            max_workers = min(max_workers, settings.HW_ENCODER_MAX_WORKERS)
+        if len(pairs) == 1 or max_workers == 1:
+            threads = settings.SINGLE_JOB_FFMPEG_THREADS
+        else:
+            threads = settings.PARALLEL_JOB_FFMPEG_THREADS
+
+        def _process(index, pair):
+            if on_start is not None:
+                on_start(index, pair)
+            self.process_media_pair(pair, add_waveform=add_waveform, waveform_effect=waveform_effect, threads=threads)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_process, index, pair): pair for index, pair in enumerate(pairs, 1)}
+            for future in as_completed(futures):
+                yield futures[future], future.exception()
+
+    def _process_with_spectrum_waveform(self, pair: MediaPair, output_path: Path, waveform_effect: Optional[str] = None,
+                                        threads: int = settings.SINGLE_JOB_FFMPEG_THREADS):
+        """Add a spectrum analyzer waveform and encode the result with FFmpeg.
+
+        Waveform frames are drawn with NumPy and streamed to FFmpeg as raw
+        RGBA video on stdin, where they are overlaid on the scaled media.
+        """
         import numpy as np
-        import librosa
-        from PIL import Image, ImageDraw
-        from moviepy.editor import (
-            AudioFileClip, ImageClip, VideoFileClip, CompositeVideoClip, VideoClip
-        )
+        import soundfile as sf
+        import scipy.fft
+        from scipy.signal import resample_poly, stft
 
         logger.debug("Analyzing audio for spectrum visualization")
-        y, sr = librosa.load(str(pair.audio.path), sr=None)
+        y, sr = sf.read(str(pair.audio.path), dtype='float32', always_2d=False)
+        if y.ndim > 1:
+            y = y.mean(axis=1)
+        # The bars only need the audible range up to 8 kHz, so analyze a
+        # 16 kHz copy; STFT cost scales with the number of samples.
+        if sr > 16000:
+            y = resample_poly(y, 16000, sr).astype(np.float32, copy=False)
+            sr = 16000
         n_fft = 2048
         hop_length = 512
-        stft = np.abs(librosa.stft(y, n_fft=n_fft, hop_length=hop_length))
-        db = librosa.amplitude_to_db(stft, ref=np.max)
-        times = librosa.times_like(db, sr=sr, hop_length=hop_length, n_fft=n_fft)
-        freqs = librosa.fft_frequencies(sr=sr, n_fft=n_fft)
+        # pyFFTW is optional; use it as the FFT backend when it is installed
+        try:
+            import pyfftw.interfaces.scipy_fft as fft_backend
+        except ImportError:
+            fft_backend = 'scipy'
+        with scipy.fft.set_backend(fft_backend):
+            freqs, _, spectrum = stft(y, fs=sr, nperseg=n_fft, noverlap=n_fft - hop_length)
+        magnitude = np.abs(spectrum)
+        # Decibels relative to the loudest bin; the floor avoids log10(0) on silence
+        db = 20 * np.log10(np.maximum(magnitude, 1e-5) / max(magnitude.max(), 1e-5))
 
-        audio_clip = AudioFileClip(str(pair.audio.path))
-        final_duration = audio_clip.duration
+        # The controller already probed the duration; only probe again if it did not
+        final_duration = pair.audio.duration or helpers.probe_duration(pair.audio.path)
+        fps = settings.DEFAULT_FRAMERATE
 
-        # --- Main Clip Setup ---
-        if pair.is_video:
-            main_clip = VideoFileClip(str(pair.media.path))
-            if main_clip.duration < final_duration:
-                main_clip = main_clip.loop(duration=final_duration)
-            elif main_clip.duration > final_duration:
-                main_clip = main_clip.subclip(0, final_duration)
-        else: # Is Image
-            main_clip = ImageClip(str(pair.media.path), duration=final_duration)
-
-        main_clip = main_clip.set_audio(audio_clip)
-        
         # --- Waveform Visualization Logic ---
         logger.debug("Generating waveform animation")
-        w, h = main_clip.size
+        w, h = (int(d) for d in settings.VIDEO_DIMENSIONS.split(':'))
         waveform_h = int(h * 0.15)
         n_bars = 64
 
         log_freqs = np.logspace(np.log10(freqs[1]), np.log10(freqs[-1]), num=n_bars + 1)
+        # Frequency-bin range of each bar, shared by every frame. Bars whose
+        # range is empty are never drawn. Bands are contiguous, so reduceat
+        # over the remaining start bins reduces exactly one band per bar.
+        bin_edges = np.searchsorted(freqs, log_freqs)
+        drawn_bars = np.flatnonzero(bin_edges[:-1] < bin_edges[1:])
+        band_starts = bin_edges[:-1][drawn_bars]
+        band_stop = bin_edges[-1]
 
-        # Helper to draw a single frame. This avoids duplicating the drawing logic.
-        def _draw_spectrum_frame(t):
-            img = Image.new('RGBA', (w, waveform_h), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            time_idx = np.searchsorted(times, t)
-            if time_idx >= len(times):
-                time_idx = len(times) - 1
-
-            bar_w = w / n_bars
-            for i in range(n_bars):
-                freq_start, freq_end = log_freqs[i], log_freqs[i+1]
-                freq_bin_start, freq_bin_end = np.searchsorted(freqs, freq_start), np.searchsorted(freqs, freq_end)
-                if freq_bin_start >= freq_bin_end:
-                    continue
-
-                band_db = db[freq_bin_start:freq_bin_end, time_idx]
-                max_db = np.max(band_db)
-                norm_height = (max_db + 80) / 80
-                norm_height = max(0, min(1, norm_height))
-                bar_h = int(norm_height * waveform_h * 0.9)
-                if bar_h < 1:
-                    continue
-
-                x1 = i * bar_w
-                y1 = waveform_h - bar_h
-                # Choose bar color based on selected effect
-                if waveform_effect == "Gradient Bars":
-                    # Simple left-to-right gradient from blue to magenta to orange
-                    t = i / max(1, (n_bars - 1))
-                    if t < 0.5:
-                        # blue (0,120,255) -> magenta (200,0,200)
-                        k = t / 0.5
-                        r = int(0 + (200 - 0) * k)
-                        g = int(120 + (0 - 120) * k)
-                        b = int(255 + (200 - 255) * k)
-                    else:
-                        # magenta (200,0,200) -> orange (255,120,0)
-                        k = (t - 0.5) / 0.5
-                        r = int(200 + (255 - 200) * k)
-                        g = int(0 + (120 - 0) * k)
-                        b = int(200 + (0 - 200) * k)
-                    color = (r, g, b, 180)
-                else:
-                    # Default "Classic Bars"
-                    color = (0, 255, 0, 180)
-                draw.rectangle([x1, y1, x1 + bar_w - 2, waveform_h], fill=color)
-            return np.array(img)
-
-        # Create the RGB clip and the Alpha mask clip separately
-        def make_frame_rgb(t):
-            return _draw_spectrum_frame(t)[:,:,:3] # Return only RGB channels
+        # Bar colors depend only on the bar index, so build the table once
+        colors = np.empty((n_bars, 4), dtype=np.uint8)
+        colors[:, 3] = 180
+        if waveform_effect == "Gradient Bars":
+            # Left-to-right gradient: blue (0,120,255) -> magenta (200,0,200)
+            # over the first half, then magenta -> orange (255,120,0)
+            pos = np.arange(n_bars) / max(1, (n_bars - 1))
+            first_half = pos < 0.5
+            k = np.where(first_half, pos / 0.5, (pos - 0.5) / 0.5)
+            colors[:, 0] = np.where(first_half, 200 * k, 200 + 55 * k)
+            colors[:, 1] = np.where(first_half, 120 - 120 * k, 120 * k)
+            colors[:, 2] = np.where(first_half, 255 - 55 * k, 200 - 200 * k)
+        else:
+            # Default "Classic Bars"
+            colors[:, :3] = (0, 255, 0)
 
-        def make_frame_mask(t):
-            return _draw_spectrum_frame(t)[:,:,3] / 255.0 # Return normalized alpha channel
+        # Pixel columns covered by each bar (end exclusive), leaving a 1px gap
+        bar_w = w / n_bars
+        bar_x = np.arange(n_bars) * bar_w
+        bar_x_start = bar_x.astype(int)
+        bar_x_end = (bar_x + bar_w - 2).astype(int) + 1
 
-        waveform_clip = VideoClip(make_frame_rgb, duration=final_duration)
-        mask_clip = VideoClip(make_frame_mask, duration=final_duration, ismask=True)
+        # Map every pixel column to its drawn bar; gap columns point at an
+        # extra zero-height, transparent bar at index len(drawn_bars).
+        col_bar = np.full(w, len(drawn_bars))
+        for j, i in enumerate(drawn_bars):
+            col_bar[bar_x_start[i]:bar_x_end[i]] = j
+        col_colors = np.vstack([colors[drawn_bars], np.zeros((1, 4), dtype=np.uint8)])[col_bar]
 
-        # Apply the mask to the waveform clip
-        waveform_clip.mask = mask_clip
+        # Main media input, looped so it always covers the audio duration
+        if pair.is_video:
+            media_input = ['-stream_loop', '-1', '-i', str(pair.media.path)]
+        else:
+            media_input = ['-loop', '1', '-framerate', str(fps), '-i', str(pair.media.path)]
 
-        # --- Composition ---
-        logger.info("Compositing video and waveform...")
-        final_video = CompositeVideoClip([
-            main_clip,
-            waveform_clip.set_pos(('center', 'bottom'))
-        ])
+        cmd = [
+            settings.FFMPEG_PATH, '-y', '-hide_banner', '-loglevel', 'error', '-nostats',
+            *media_input,
+            '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{w}x{waveform_h}',
+            '-framerate', str(fps), '-i', 'pipe:0',
+            '-i', str(pair.audio.path),
+            '-filter_complex',
+            f'[0:v]{settings.FFMPEG_VIDEO_FILTERS},fps={fps}[bg];[bg][1:v]overlay=0:H-h:shortest=1[v]',
+            '-map', '[v]', '-map', '2:a',
+            '-t', str(final_duration),
+            '-c:v', self.video_encoder, *self.video_encoder_args, *self.gop_args,
+            '-tag:v', 'avc1',
+            '-pix_fmt', 'yuv420p',
+            '-r', str(fps), '-vsync', 'cfr',
+            '-c:a', 'aac', '-b:a', settings.DEFAULT_AUDIO_BITRATE, '-ac', '2', '-ar', '44100',
+            '-threads', str(threads), '-movflags', '+faststart',
+            str(output_path)
+        ]
 
-        # --- Write to File ---
         logger.info(f"Writing final video to {output_path.name}...")
-        final_video.write_videofile(
-            str(output_path),
-            codec='libx264',
-            audio_codec='aac',
-            audio_bitrate=settings.DEFAULT_AUDIO_BITRATE,
-            temp_audiofile=str(self.results_dir / "temp-audio.m4a"),
-            threads=4,
-            fps=settings.DEFAULT_FRAMERATE,
-            preset=settings.DEFAULT_VIDEO_PRESET,
-            ffmpeg_params=[
-                '-pix_fmt', 'yuv420p',
-                '-profile:v', 'main',
-                '-level', '4.0',
-                '-tag:v', 'avc1',
-                '-r', str(settings.DEFAULT_FRAMERATE),
-                '-vsync', 'cfr',
-                '-vf', settings.FFMPEG_VIDEO_FILTERS,
-                '-ac', '2', '-ar', '44100',
-                '-movflags', '+faststart'
-            ]
+        n_frames = int(np.ceil(final_duration * fps))
+        # STFT columns are centred hop_length samples apart starting at t=0,
+        # so each frame's column follows directly from its timestamp
+        frame_cols = np.minimum(np.arange(n_frames) * sr // (fps * hop_length), db.shape[1] - 1)
+        chunk = settings.WAVEFORM_CHUNK_FRAMES
+        render = functools.partial(
+            _render_waveform_frames, db, band_starts=band_starts, band_stop=band_stop,
+            col_bar=col_bar, col_colors=col_colors, waveform_h=waveform_h
+        )
+        # Chunks render on worker threads (the large NumPy operations release
+        # the GIL) while this thread writes finished chunks to FFmpeg in order.
+        # At most workers + 1 chunks are in flight, each rendered into one of
+        # a fixed set of buffers that is reused once its chunk is written.
+        workers = settings.WAVEFORM_RENDER_THREADS
+        free_buffers = deque(
+            np.empty((chunk, waveform_h, w, 4), dtype=np.uint8) for _ in range(workers + 1)
         )
 
-    def _process_video_ffmpeg(self, pair: MediaPair, output_path: Path):
-        """Create an MP4 using video input re-encoded for compatibility."""
+        # stderr goes to a temporary file rather than a pipe: nothing reads it
+        # while frames are being written, and a full pipe would block FFmpeg.
+        with tempfile.TemporaryFile() as stderr_file:
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=stderr_file)
+
+            def _write_next():
+                future, buffer = pending.popleft()
+                proc.stdin.write(future.result().data)
+                free_buffers.append(buffer)
+
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    pending = deque()
+                    try:
+                        for start in range(0, n_frames, chunk):
+                            cols = frame_cols[start:start + chunk]
+                            buffer = free_buffers.popleft()
+                            pending.append((executor.submit(render, cols, out=buffer[:len(cols)]), buffer))
+                            if len(pending) > workers:
+                                _write_next()
+                        while pending:
+                            _write_next()
+                        proc.stdin.close()
+                    except OSError as e:
+                        # FFmpeg exited early (Windows reports a closed pipe
+                        # as EINVAL); its error output is reported below
+                        if not isinstance(e, BrokenPipeError) and e.errno != errno.EINVAL:
+                            raise
+                        for future, _ in pending:
+                            future.cancel()
+                proc.wait()
+            finally:
+                if proc.returncode is None:
+                    proc.kill()
+                    proc.wait()
+                if proc.stdin and not proc.stdin.closed:
+                    try:
+                        proc.stdin.close()
+                    except OSError:
+                        pass
+            if proc.returncode != 0:
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode(errors='replace').strip()
+                raise RuntimeError(f"FFmpeg failed: {stderr}")
+
+    def _process_video_ffmpeg(self, pair: MediaPair, output_path: Path, threads: int = settings.SINGLE_JOB_FFMPEG_THREADS):
+        """Create an MP4 from video input, re-encoding only when it is not already compliant."""
         video_duration = helpers.get_video_duration(settings.FFMPEG_PATH, str(pair.media.path))
-        common_encode = [
-            '-c:v', 'libx264',
-            '-preset', settings.DEFAULT_VIDEO_PRESET,
-            '-profile:v', 'main',
-            '-level', '4.0',
-            '-tag:v', 'avc1',
-            '-pix_fmt', 'yuv420p',
-            '-vf', settings.FFMPEG_VIDEO_FILTERS,
-            '-r', str(settings.DEFAULT_FRAMERATE),
-            '-vsync', 'cfr',
+        audio_encode = [
             '-c:a', 'aac', '-b:a', settings.DEFAULT_AUDIO_BITRATE,
             '-ac', '2', '-ar', '44100',
             '-movflags', '+faststart',
-            '-threads', '4'
         ]
+        codec_matches, size_matches, fps_matches = self._match_output_format(pair.media.path)
+        if codec_matches and size_matches and fps_matches:
+            logger.info("Video already matches the output format; copying the video stream")
+            video_encode = ['-c:v', 'copy', '-tag:v', 'avc1']
+        else:
+            # Scaling and frame-rate conversion are skipped when the source
+            # already has the output size or rate
+            video_encode = [
+                '-c:v', self.video_encoder,
+                *self.video_encoder_args,
+                *self.gop_args,
+                '-tag:v', 'avc1',
+                '-pix_fmt', 'yuv420p',
+                *([] if size_matches else ['-vf', settings.FFMPEG_VIDEO_FILTERS]),
+                *([] if fps_matches else ['-r', str(settings.DEFAULT_FRAMERATE)]),
+                '-vsync', 'cfr',
+                '-threads', str(threads)
+            ]
 
+        loop_args = []
         if video_duration < pair.audio.duration:
             loops = int(pair.audio.duration / video_duration) + 1
             logger.info(f"Looping video {loops} times to match audio duration")
-            cmd = [
-                settings.FFMPEG_PATH, '-y',
-                '-stream_loop', str(loops - 1),
-                '-i', str(pair.media.path),
-                '-i', str(pair.audio.path),
-                '-t', str(pair.audio.duration),
-                *common_encode,
-                '-shortest', str(output_path)
-            ]
+            loop_args = ['-stream_loop', str(loops - 1)]
         else:
             logger.info(f"Trimming video to {pair.audio.duration} seconds")
-            cmd = [
-                settings.FFMPEG_PATH, '-y',
-                '-i', str(pair.media.path),
-                '-i', str(pair.audio.path),
-                '-t', str(pair.audio.duration),
-                *common_encode,
-                '-shortest', str(output_path)
-            ]
-        subprocess.run(cmd, check=True, capture_output=True, text=True)
 
-    def _process_image_ffmpeg(self, pair: MediaPair, output_path: Path):
+        # Looping, trimming and muxing all happen in this single FFmpeg pass
+        cmd = [
+            settings.FFMPEG_PATH, '-y', '-hide_banner', '-loglevel', 'error', '-nostats',
+            *loop_args,
+            '-i', str(pair.media.path),
+            '-i', str(pair.audio.path),
+            '-map', '0:v:0', '-map', '1:a:0',
+            '-t', str(pair.audio.duration),
+            *video_encode,
+            *audio_encode,
+            '-shortest', str(output_path)
+        ]
+        helpers.run_ffmpeg(cmd)
+
+    @staticmethod
+    def _match_output_format(video_path: Path) -> Tuple[bool, bool, bool]:
+        """Compare a video's stream with the output format.
+
+        Returns (codec, size, fps) flags. The codec matches when the stream
+        is H.264 yuv420p within the Main profile / level 4.0 limits the
+        re-encode targets and carries no display rotation, which a copy
+        would pass on to players; all three must match for a stream copy.
+        """
+        info = helpers.probe_video_stream(str(video_path))
+        codec_matches = (
+            info.get('codec_name') == 'h264' and info.get('pix_fmt') == 'yuv420p'
+            and info.get('profile') in ('Constrained Baseline', 'Baseline', 'Main')
+            and 0 < int(info.get('level', 0)) <= 40
+            and info.get('rotation', 0) == 0
+        )
+        width, height = (int(d) for d in settings.VIDEO_DIMENSIONS.split(':'))
+        # width and height are the coded size; FFmpeg autorotates on decode,
+        # so a rotated stream comes out transposed and still needs the filter
+        size_matches = (
+            (info.get('width'), info.get('height')) == (width, height)
+            and info.get('rotation', 0) == 0
+        )
+        num, _, den = info.get('r_frame_rate', '0/1').partition('/')
+        try:
+            fps_matches = abs(int(num) / int(den or 1) - settings.DEFAULT_FRAMERATE) < 0.01
+        except (ValueError, ZeroDivisionError):
+            fps_matches = False
+        return codec_matches, size_matches, fps_matches
+
+    def _process_image_ffmpeg(self, pair: MediaPair, output_path: Path, threads: int = settings.SINGLE_JOB_FFMPEG_THREADS):
         logger.info("Creating video with audio from image...")
+        # -tune stillimage is specific to libx264
+        tune_args = ['-tune', 'stillimage'] if self.video_encoder == 'libx264' else []
         cmd = [
-            settings.FFMPEG_PATH, '-y',
+            settings.FFMPEG_PATH, '-y', '-hide_banner', '-loglevel', 'error', '-nostats',
             '-loop', '1', '-framerate', str(settings.DEFAULT_FRAMERATE),
             '-i', str(pair.media.path),
             '-i', str(pair.audio.path),
             '-t', str(pair.audio.duration),
-            '-c:v', 'libx264', '-preset', settings.DEFAULT_VIDEO_PRESET, '-tune', 'stillimage',
-            '-profile:v', 'main', '-level', '4.0', '-tag:v', 'avc1',
+            '-c:v', self.video_encoder, *self.video_encoder_args, *self.gop_args, *tune_args,
+            '-tag:v', 'avc1',
             '-pix_fmt', 'yuv420p',
             '-vf', settings.FFMPEG_VIDEO_FILTERS,
             '-r', str(settings.DEFAULT_FRAMERATE), '-vsync', 'cfr',
             '-c:a', 'aac', '-b:a', settings.DEFAULT_AUDIO_BITRATE, '-ac', '2', '-ar', '44100',
-            '-threads', '4', '-movflags', '+faststart',
+            '-threads', str(threads), '-movflags', '+faststart',
             str(output_path)
         ]
-        subprocess.run(cmd, check=True, capture_output=True, text=True)
+        helpers.run_ffmpeg(cmd)
 
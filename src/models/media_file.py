@@ -1,40 +1,43 @@
 """Media file model classes."""
 from pathlib import Path
-from typing import List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-@dataclass
+from src.config.settings import SUPPORTED_VIDEO_FORMATS, RESULT_FILE_PREFIX
+
+@dataclass(slots=True, frozen=True)
 class MediaFile:
     """Base class for media files."""
     path: Path
     base_name: str
-    
-    @property
-    def extension(self) -> str:
-        """Get file extension."""
-        return self.path.suffix.lower()
-    
-    @property
-    def name(self) -> str:
-        """Get file name."""
-        return self.path.name
+    # Derived from path once at construction
+    extension: str = field(init=False, repr=False, compare=False)
+    name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'extension', self.path.suffix.lower())
+        object.__setattr__(self, 'name', self.path.name)
+
+    @classmethod
+    def from_path(cls, path: Path, **kwargs) -> 'MediaFile':
+        """Create a media file named after the path's stem."""
+        return cls(path=path, base_name=path.stem, **kwargs)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AudioFile(MediaFile):
     """Audio file representation."""
     duration: float = 0.0
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VideoFile(MediaFile):
     """Video file representation."""
     duration: float = 0.0
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ImageFile(MediaFile):
     """Image file representation."""
     pass
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MediaPair:
     """Represents a pair of audio and media files to process."""
     audio: AudioFile
@@ -43,11 +46,9 @@ class MediaPair:
     @property
     def is_video(self) -> bool:
         """Check if the media file is a video."""
-        from src.config.settings import SUPPORTED_VIDEO_FORMATS
         return self.media.extension in SUPPORTED_VIDEO_FORMATS
     
     @property
     def output_name(self) -> str:
         """Generate output file name."""
-        from src.config.settings import RESULT_FILE_PREFIX
         return f"{RESULT_FILE_PREFIX}{self.audio.base_name}.mp4"
\ No newline at end of file
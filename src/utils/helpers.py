@@ -2,6 +2,7 @@
 import os
 import re
 import json
+import functools
 import shutil
 import subprocess
 import logging
@@ -57,9 +58,12 @@ def save_last_input_dir(path: str) -> None:
     except Exception:
         pass
 
+@functools.lru_cache(maxsize=None)
 def check_ffmpeg(ffmpeg_path: str) -> bool:
     """
     Check if FFmpeg is installed and working.
+
+    The result is cached per FFmpeg path.
     
     Args:
         ffmpeg_path: Path to FFmpeg executable
@@ -78,9 +82,78 @@ def check_ffmpeg(ffmpeg_path: str) -> bool:
         logger.error(f"Error running FFmpeg: {str(e)}")
         return False
 
+@functools.lru_cache(maxsize=None)
+def detect_best_encoder(ffmpeg_path: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Pick the H.264 encoder to use and its encoder-specific options.
+
+    Hardware encoders are listed by most FFmpeg builds even when the
+    matching GPU or driver is missing, so each candidate is confirmed with
+    a tiny test encode. The result is cached per FFmpeg path.
+
+    Args:
+        ffmpeg_path: Path to FFmpeg executable
+
+    Returns:
+        Tuple[str, Tuple[str, ...]]: Encoder name and its options
+    """
+    from src.config.settings import VIDEO_ENCODER, HW_VIDEO_ENCODERS, VIDEO_ENCODER_ARGS
+
+    def _result(encoder: str) -> Tuple[str, Tuple[str, ...]]:
+        return encoder, tuple(VIDEO_ENCODER_ARGS.get(encoder, []))
+
+    if VIDEO_ENCODER != 'auto':
+        return _result(VIDEO_ENCODER)
+
+    try:
+        listing = subprocess.run(
+            [ffmpeg_path, '-hide_banner', '-encoders'],
+            capture_output=True, text=True
+        ).stdout
+    except Exception:
+        return _result('libx264')
+
+    for encoder in HW_VIDEO_ENCODERS:
+        if f' {encoder} ' not in listing:
+            continue
+        test = subprocess.run(
+            [ffmpeg_path, '-hide_banner', '-loglevel', 'error',
+             '-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.1',
+             '-c:v', encoder, *VIDEO_ENCODER_ARGS.get(encoder, []),
+             '-pix_fmt', 'yuv420p', '-f', 'null', '-'],
+            capture_output=True, text=True
+        )
+        if test.returncode == 0:
+            logger.debug(f"Using hardware encoder {encoder}")
+            return _result(encoder)
+    return _result('libx264')
+
+def _cached_per_file(maxsize: int = 256):
+    """
+    Memoize func(path, *args) on the file's path, modification time and size.
+
+    Keying on the file's stat means a file rewritten in place is probed
+    again, while repeat calls for an unchanged file cost one os.stat().
+    """
+    def decorator(func):
+        @functools.lru_cache(maxsize=maxsize)
+        def cached(path: str, mtime_ns: int, size: int, *args):
+            return func(path, *args)
+
+        @functools.wraps(func)
+        def wrapper(path, *args):
+            stat = os.stat(path)
+            return cached(str(path), stat.st_mtime_ns, stat.st_size, *args)
+        return wrapper
+    return decorator
+
 def get_video_duration(ffmpeg_path: str, video_path: str) -> float:
     """
-    Get the duration of a video file using FFmpeg.
+    Get the duration of a video file.
+
+    The duration is read from the container metadata with the ffprobe at
+    settings.FFPROBE_PATH. Results are cached per file path, modification
+    time and size.
     
     Args:
         ffmpeg_path: Path to FFmpeg executable
@@ -89,6 +162,26 @@ def get_video_duration(ffmpeg_path: str, video_path: str) -> float:
     Returns:
         float: Duration in seconds
     """
+    return _video_duration(video_path, ffmpeg_path)
+
+@_cached_per_file()
+def _video_duration(video_path: str, ffmpeg_path: str) -> float:
+    """Worker for get_video_duration."""
+    from src.config.settings import FFPROBE_PATH
+    if os.path.exists(FFPROBE_PATH):
+        result = subprocess.run(
+            [FFPROBE_PATH, '-v', 'error', '-show_entries', 'format=duration',
+             '-of', 'json', video_path],
+            capture_output=True,
+            text=True
+        )
+        try:
+            return float(json.loads(result.stdout)['format']['duration'])
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Could not determine video duration")
+
+    # No ffprobe available: fall back to decoding the file and
+    # reading the duration FFmpeg reports on stderr
     result = subprocess.run(
         [ffmpeg_path, '-i', video_path, '-f', 'null', '-'],
         stderr=subprocess.PIPE,
@@ -106,6 +199,136 @@ def get_video_duration(ffmpeg_path: str, video_path: str) -> float:
     
     raise ValueError("Could not determine video duration")
 
+def probe_video_stream(video_path: str) -> dict:
+    """
+    Get the codec parameters of the first video stream of a file.
+
+    Results are cached per file path, modification time and size.
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        dict: ffprobe stream fields (codec_name, profile, level, pix_fmt,
+        width, height, r_frame_rate) plus the display rotation in degrees
+        (rotation), or an empty dict if unavailable
+    """
+    return dict(_video_stream(video_path))
+
+@_cached_per_file()
+def _video_stream(video_path: str) -> Tuple[Tuple[str, object], ...]:
+    """Worker for probe_video_stream; items are a tuple so the cache can share them."""
+    from src.config.settings import FFPROBE_PATH
+    if not os.path.exists(FFPROBE_PATH):
+        return ()
+    result = subprocess.run(
+        [FFPROBE_PATH, '-v', 'error', '-select_streams', 'v:0',
+         '-show_entries', 'stream=codec_name,profile,level,pix_fmt,width,height,r_frame_rate'
+                          ':stream_side_data=rotation:stream_tags=rotate',
+         '-of', 'json', video_path],
+        capture_output=True,
+        text=True
+    )
+    try:
+        stream = json.loads(result.stdout)['streams'][0]
+    except (ValueError, KeyError, IndexError, TypeError):
+        return ()
+    # The display matrix side data carries the rotation; older muxers
+    # only set a rotate tag
+    rotation = stream.pop('tags', {}).get('rotate', 0)
+    for side_data in stream.pop('side_data_list', []):
+        rotation = side_data.get('rotation', rotation)
+    try:
+        stream['rotation'] = int(float(rotation)) % 360
+    except (TypeError, ValueError):
+        stream['rotation'] = 0
+    return tuple(stream.items())
+
+@_cached_per_file(maxsize=1024)
+def probe_duration(path) -> float:
+    """
+    Get the duration of a media file from its metadata.
+
+    The file headers are read in-process with mutagen; ffprobe is only
+    spawned for files mutagen cannot parse. Results are cached per file
+    path, modification time and size.
+
+    Args:
+        path: Path to the media file
+
+    Returns:
+        float: Duration in seconds
+    """
+    try:
+        import mutagen
+        info = mutagen.File(str(path))
+        if info is not None and info.info.length > 0:
+            return float(info.info.length)
+    except Exception:
+        pass
+
+    from src.config.settings import FFPROBE_PATH
+    result = subprocess.run(
+        [FFPROBE_PATH, '-v', 'error', '-show_entries', 'format=duration',
+         '-of', 'default=nw=1:nk=1', str(path)],
+        capture_output=True,
+        text=True
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        raise ValueError(f"Could not determine duration of {Path(path).name}")
+
+def run_ffmpeg(cmd: list) -> None:
+    """
+    Run an FFmpeg command to completion.
+
+    Only stderr is captured, as raw bytes; commands should pass
+    -loglevel error so it holds nothing but error messages.
+
+    Args:
+        cmd: Full FFmpeg command line
+
+    Raises:
+        RuntimeError: If FFmpeg exits with a non-zero status
+    """
+    result = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg failed: {result.stderr.decode(errors='replace').strip()}")
+
+def load_encode_state(results_dir: Path) -> dict:
+    """Load the per-output encode options recorded in a results folder."""
+    from src.config.settings import ENCODE_STATE_FILE
+    try:
+        return json.loads((results_dir / ENCODE_STATE_FILE).read_text(encoding='utf-8'))
+    except Exception:
+        return {}
+
+
+def save_encode_state(results_dir: Path, state: dict) -> None:
+    """Save the per-output encode options to a results folder."""
+    from src.config.settings import ENCODE_STATE_FILE
+    try:
+        (results_dir / ENCODE_STATE_FILE).write_text(json.dumps(state), encoding='utf-8')
+    except Exception:
+        pass
+
+def is_up_to_date(output_path: Path, *sources: Path) -> bool:
+    """
+    Check whether an output file is newer than all of its sources.
+    
+    Args:
+        output_path: Generated file
+        sources: Files the output was generated from
+        
+    Returns:
+        bool: True if the output exists and no source is newer
+    """
+    try:
+        return os.path.getmtime(output_path) >= max(os.path.getmtime(src) for src in sources)
+    except OSError:
+        return False
+
 def ensure_directory(path: Path) -> None:
     """
     Ensure a directory exists, create it if it doesn't.
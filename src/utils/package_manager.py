@@ -1,32 +1,37 @@
 """Package management utilities."""
+import re
 import sys
 import subprocess
-from importlib.metadata import version, PackageNotFoundError
+from importlib.metadata import distributions
+from typing import List, Set
 
 REQUIRED_PACKAGES = {
-    'moviepy': 'moviepy',
     'PyQt6': 'PyQt6',
-    'librosa': 'librosa',
-    'Pillow': 'Pillow'
+    'numpy': 'numpy',
+    'scipy': 'scipy',
+    'soundfile': 'soundfile',
+    'mutagen': 'mutagen'
 }
 
-def check_package(package_name: str) -> bool:
-    """Check if a package is installed."""
-    try:
-        version(package_name)
-        return True
-    except PackageNotFoundError:
-        return False
+def _normalize(name: str) -> str:
+    """Normalize a distribution name for comparison (PEP 503)."""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+def installed_packages() -> Set[str]:
+    """Return the normalized names of all installed distributions."""
+    return {_normalize(dist.metadata['Name']) for dist in distributions() if dist.metadata['Name']}
 
-def install_package(package_name: str) -> bool:
-    """Install a package using pip."""
+def install_packages(package_names: List[str]) -> bool:
+    """Install packages using a single pip invocation."""
     try:
         subprocess.check_call([
-            sys.executable, 
-            '-m', 
-            'pip', 
-            'install', 
-            package_name
+            sys.executable,
+            '-m',
+            'pip',
+            'install',
+            '--disable-pip-version-check',
+            '--no-input',
+            *package_names
         ])
         return True
     except subprocess.CalledProcessError:
@@ -34,24 +39,20 @@ def install_package(package_name: str) -> bool:
 
 def check_and_install_dependencies() -> bool:
     """Check and install all required packages."""
-    missing_packages = []
-    
-    # Check all required packages
-    for package_name in REQUIRED_PACKAGES:
-        if not check_package(package_name):
-            missing_packages.append(REQUIRED_PACKAGES[package_name])
-    
+    # One scan of the installed distributions covers every package
+    installed = installed_packages()
+    missing_packages = [
+        pip_name for package_name, pip_name in REQUIRED_PACKAGES.items()
+        if _normalize(package_name) not in installed
+    ]
+
     if not missing_packages:
         return True
-    
-    print("\nInstalling missing dependencies...")
-    success = True
-    
-    # Install missing packages
-    for package in missing_packages:
-        print(f"Installing {package}...")
-        if not install_package(package):
-            print(f"Failed to install {package}")
-            success = False
-    
-    return success
\ No newline at end of file
+
+    print(f"\nInstalling missing dependencies: {', '.join(missing_packages)}...")
+    # A single pip run pays interpreter start-up and dependency resolution once
+    if not install_packages(missing_packages):
+        print("Failed to install dependencies")
+        return False
+
+    return True
@@ -9,21 +9,31 @@ It should contain minimal business logic. Its primary roles are:
 - Updating the UI based on signals received from the Controller.
 """
 import sys
-import os
+from collections import deque
 from pathlib import Path
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLineEdit, QTextEdit, QProgressBar, QFileDialog,
+    QPushButton, QLineEdit, QPlainTextEdit, QProgressBar, QFileDialog,
     QMessageBox, QTabWidget, QGroupBox, QCheckBox, QComboBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, QEvent
+from PyQt6.QtGui import QTextCursor
 
 # Local imports to be deferred
 # from src.controllers.media_controller import MediaController
 from src.utils import helpers
 from src.config import settings
 
+# Skip per-entry symlink resolution and custom icon lookups, which stat
+# every file and stall file dialogs on network drives and large folders.
+_FILE_DIALOG_OPTIONS = QFileDialog.Option.DontResolveSymlinks | QFileDialog.Option.DontUseCustomDirectoryIcons
+_DIR_DIALOG_OPTIONS = _FILE_DIALOG_OPTIONS | QFileDialog.Option.ShowDirsOnly
+_MP3_FILTER = "MP3 files (*.mp3)"
+_MEDIA_FILTER = "Media files (*.jpg *.jpeg *.webp *.mp4)"
+# Most log lines kept, both in the widget and in the pending buffer
+_LOG_MAX_LINES = 5000
+
 class MainWindow(QMainWindow):
     """Main window of the application (View)."""
 
@@ -35,19 +45,17 @@ class MainWindow(QMainWindow):
         from src.controllers.media_controller import MediaController
         self.controller = MediaController()
 
-        # Basic checks before initializing UI
-        if not helpers.check_ffmpeg(settings.FFMPEG_PATH):
-            QMessageBox.critical(self, "Error", "FFmpeg is required but not found.")
-            sys.exit(1)
-
         self.init_ui()
         self.connect_signals()
-        self.load_last_used_paths()
+        # Check FFmpeg once the window is up rather than before building it
+        QTimer.singleShot(0, self._verify_ffmpeg)
+        # Read the saved path once the event loop runs, so disk access does
+        # not hold up building and showing the window
+        QTimer.singleShot(0, self.load_last_used_paths)
 
     def init_ui(self):
         """Initialize the user interface components."""
         self.setMinimumSize(700, 600)
-        self.center_window()
 
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
@@ -62,7 +70,9 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(self.tabs)
 
         self._setup_directory_tab()
-        self._setup_single_file_tab()
+        # The single file tab is built the first time it is opened
+        self._single_tab_built = False
+        self.tabs.currentChanged.connect(self._on_tab_changed)
 
         # --- Common UI Elements ---
         self.progress_bar = QProgressBar()
@@ -71,10 +81,27 @@ class MainWindow(QMainWindow):
         self.progress_bar.setFormat("%p%")
         main_layout.addWidget(self.progress_bar)
 
-        self.output_text = QTextEdit()
+        # Plain text skips the rich-text layout QTextEdit runs on every
+        # append; the block cap keeps long runs from growing the log unbounded.
+        self.output_text = QPlainTextEdit()
         self.output_text.setReadOnly(True)
+        self.output_text.setMaximumBlockCount(_LOG_MAX_LINES)
+        # Keep the last line at the bottom edge while following new output,
+        # without re-centering the view on each append
+        self.output_text.setCenterOnScroll(False)
+        # A read-only log has nothing to undo; don't record every append
+        self.output_text.setUndoRedoEnabled(False)
         main_layout.addWidget(self.output_text)
 
+        # Log lines are buffered and written in one append per timer tick.
+        # While the window is hidden they stay here, bounded like the widget.
+        self._log_buffer: deque[str] = deque(maxlen=_LOG_MAX_LINES)
+        self._log_dropped = 0
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(50)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush_log)
+
         exit_btn = QPushButton("Exit")
         exit_btn.clicked.connect(self.close)
         main_layout.addWidget(exit_btn, alignment=Qt.AlignmentFlag.AlignRight)
@@ -165,13 +192,24 @@ class MainWindow(QMainWindow):
         self.start_single_btn = QPushButton("Start Processing Single File")
         self.start_single_btn.clicked.connect(self.start_single_file_processing)
         self.start_single_btn.setEnabled(False)
+        self._single_start_enabled = False
         layout.addWidget(self.start_single_btn)
         layout.addStretch()
 
+    def _on_tab_changed(self, index: int):
+        """Build the single file tab on first activation."""
+        if not self._single_tab_built and self.tabs.widget(index) is self.tab_single:
+            self._single_tab_built = True
+            self._setup_single_file_tab()
+
     def connect_signals(self):
         """Connect signals from the controller to UI slots."""
-        self.controller.progress_update.connect(self.update_output)
-        self.controller.progress_value.connect(self.progress_bar.setValue)
+        # Progress is emitted from the worker thread, so these are always
+        # queued; saying so skips AutoConnection's per-emit thread check.
+        queued = Qt.ConnectionType.QueuedConnection
+        self.controller.progress_update.connect(self.update_output, queued)
+        self.controller.progress_value.connect(self.progress_bar.setValue, queued)
+        # The controller re-emits processing_finished on the GUI thread
         self.controller.processing_finished.connect(self.on_processing_complete)
 
     # --- Action Handlers / Slots --- 
@@ -186,7 +224,7 @@ class MainWindow(QMainWindow):
         add_waveform = self.dir_waveform_checkbox.isChecked()
         effect = self.dir_effect_combo.currentText() if add_waveform else None
 
-        self.output_text.clear()
+        self._clear_output()
         self.progress_bar.setValue(0)
         self.set_ui_enabled(False)
         self.controller.process_directory(input_dir, add_waveform=add_waveform, waveform_effect=effect)
@@ -204,57 +242,127 @@ class MainWindow(QMainWindow):
         add_waveform = self.single_waveform_checkbox.isChecked()
         effect = self.single_effect_combo.currentText() if add_waveform else None
 
-        self.output_text.clear()
+        self._clear_output()
         self.progress_bar.setValue(0)
         self.set_ui_enabled(False)
         self.controller.process_single_pair(mp3_path, media_path, output_dir, add_waveform=add_waveform, waveform_effect=effect)
 
     def on_processing_complete(self, success: bool):
         """Slot to handle completion of a processing task."""
+        self._flush_log()
         self.set_ui_enabled(True)
         if success:
-            QMessageBox.information(self, "Done", "Processing completed successfully!")
+            icon, text = QMessageBox.Icon.Information, "Processing completed successfully!"
         else:
-            QMessageBox.warning(self, "Done", "Processing failed. Check logs for details.")
+            icon, text = QMessageBox.Icon.Warning, "Processing failed. Check logs for details."
+        # show() instead of exec(): no nested event loop, so queued signals
+        # and log flushes keep being processed while the box is up. open()
+        # would force window modality; show() leaves the window usable.
+        msg = QMessageBox(icon, "Done", text, QMessageBox.StandardButton.Ok, self)
+        msg.setWindowModality(Qt.WindowModality.NonModal)
+        msg.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        msg.show()
 
     def update_output(self, text: str):
-        """Slot to append text to the output log."""
-        self.output_text.append(text)
-        self.output_text.verticalScrollBar().setValue(self.output_text.verticalScrollBar().maximum())
+        """Slot to queue text for the output log."""
+        if len(self._log_buffer) == self._log_buffer.maxlen:
+            # The deque drops the oldest line; count it for the notice
+            self._log_dropped += 1
+        self._log_buffer.append(text)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_log(self):
+        """Append all buffered log lines to the output log at once."""
+        if not self._log_buffer or not self._is_log_visible():
+            return
+        # Insert straight into the document, skipping the widget's per-append
+        # cursor and viewport bookkeeping, and repaint once afterwards.
+        scrollbar = self.output_text.verticalScrollBar()
+        follow = scrollbar.value() == scrollbar.maximum()
+        document = self.output_text.document()
+        if self._log_dropped:
+            # Give up one more line so the notice itself fits under the cap
+            lines = list(self._log_buffer)[1:]
+            lines.insert(0, f"... {self._log_dropped + 1} earlier messages truncated ...")
+            self._log_dropped = 0
+        else:
+            lines = self._log_buffer
+        text = "\n".join(lines)
+        self.output_text.setUpdatesEnabled(False)
+        try:
+            cursor = QTextCursor(document)
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertText(text if document.isEmpty() else "\n" + text)
+            if follow:
+                scrollbar.setValue(scrollbar.maximum())
+        finally:
+            self.output_text.setUpdatesEnabled(True)
+        self._log_buffer.clear()
+
+    def _is_log_visible(self) -> bool:
+        """Check whether the output log can currently be seen."""
+        # Minimized windows still report their widgets as visible
+        return self.output_text.isVisible() and not self.isMinimized()
+
+    def showEvent(self, event):
+        """Show lines logged while the window was hidden."""
+        super().showEvent(event)
+        self._flush_log()
+
+    def changeEvent(self, event):
+        """Show lines logged while the window was minimized."""
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self._flush_log()
+
+    def _clear_output(self):
+        """Clear the output log and any lines still waiting to be shown."""
+        self._log_buffer.clear()
+        self._log_dropped = 0
+        self.output_text.clear()
 
     # --- UI Helper Methods ---
 
+    def _verify_ffmpeg(self):
+        """Quit with an error if FFmpeg is not available."""
+        if not helpers.check_ffmpeg(settings.FFMPEG_PATH):
+            QMessageBox.critical(self, "Error", "FFmpeg is required but not found.")
+            QApplication.exit(1)
+
     def set_ui_enabled(self, enabled: bool):
         """Enable or disable UI elements during processing."""
         self.tabs.setEnabled(enabled)
         self.start_dir_btn.setEnabled(enabled and bool(self.dir_input.text()))
-        self.start_single_btn.setEnabled(enabled and self._are_single_inputs_valid())
+        if self._single_tab_built:
+            self._set_single_start_enabled(enabled and self._are_single_inputs_valid())
 
     def browse_directory(self):
         """Open directory selection dialog for the directory tab."""
-        dir_path = QFileDialog.getExistingDirectory(self, "Select Input Directory")
+        dir_path = QFileDialog.getExistingDirectory(self, "Select Input Directory", options=_DIR_DIALOG_OPTIONS)
         if dir_path:
             self.dir_input.setText(dir_path)
             self.start_dir_btn.setEnabled(True)
-            helpers.save_last_input_dir(dir_path) # This could also be moved to controller
+            # Save after the handler returns so the UI updates first
+            QTimer.singleShot(0, lambda p=dir_path: helpers.save_last_input_dir(p))
 
     def browse_mp3_file(self):
         """Open file dialog for MP3 selection."""
-        path, _ = QFileDialog.getOpenFileName(self, "Select MP3 File", "", "MP3 files (*.mp3)")
+        path, _ = QFileDialog.getOpenFileName(self, "Select MP3 File", "", _MP3_FILTER, options=_FILE_DIALOG_OPTIONS)
         if path:
             self.mp3_input.setText(path)
             self._check_single_file_inputs()
 
     def browse_media_file(self):
         """Open file dialog for media source selection."""
-        path, _ = QFileDialog.getOpenFileName(self, "Select Media File", "", "Media files (*.jpg *.jpeg *.webp *.mp4)")
+        path, _ = QFileDialog.getOpenFileName(self, "Select Media File", "", _MEDIA_FILTER, options=_FILE_DIALOG_OPTIONS)
         if path:
             self.media_input.setText(path)
             self._check_single_file_inputs()
 
     def browse_output_directory(self):
         """Open directory dialog for single file output."""
-        path = QFileDialog.getExistingDirectory(self, "Select Output Directory")
+        path = QFileDialog.getExistingDirectory(self, "Select Output Directory", options=_DIR_DIALOG_OPTIONS)
         if path:
             self.output_dir_input.setText(path)
             self._check_single_file_inputs()
@@ -265,16 +373,23 @@ class MainWindow(QMainWindow):
 
     def _check_single_file_inputs(self):
         """Enable the start button if all single file inputs are valid."""
-        self.start_single_btn.setEnabled(self._are_single_inputs_valid())
+        self._set_single_start_enabled(self._are_single_inputs_valid())
+
+    def _set_single_start_enabled(self, enabled: bool):
+        """Enable the single file start button, skipping no-op updates."""
+        # setEnabled repolishes the button even when the state is unchanged
+        if enabled != self._single_start_enabled:
+            self.start_single_btn.setEnabled(enabled)
+            self._single_start_enabled = enabled
 
     def center_window(self):
-        """Center the window on the primary screen."""
-        screen = QApplication.primaryScreen().geometry()
-        size = self.geometry()
-        self.move(
-            (screen.width() - size.width()) // 2,
-            (screen.height() - size.height()) // 2
-        )
+        """Center the window on the primary screen.
+
+        Call after show(), once the window has its final size.
+        """
+        frame = self.frameGeometry()
+        frame.moveCenter(QApplication.primaryScreen().availableGeometry().center())
+        self.move(frame.topLeft())
 
     def load_last_used_paths(self):
         """Load the last used directory path from settings."""
@@ -294,5 +409,6 @@ def run_gui():
     
     window = MainWindow()
     window.show()
+    window.center_window()
     
     sys.exit(app.exec())